@@ -49,7 +49,7 @@ async def login(
         )
     
     # Verifiziere Passwort
-    if not auth_service.verify_password(login_data.password, teacher.hashed_password):
+    if not await auth_service.verify_password_async(login_data.password, teacher.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Benutzername oder Passwort falsch",
@@ -130,7 +130,7 @@ async def change_password(
     Ändert das Passwort des aktuellen Teachers.
     """
     # Verifiziere aktuelles Passwort
-    if not auth_service.verify_password(
+    if not await auth_service.verify_password_async(
         password_data.current_password, 
         current_teacher.hashed_password
     ):
@@ -140,7 +140,7 @@ async def change_password(
         )
     
     # Update Passwort
-    new_hash = auth_service.get_password_hash(password_data.new_password)
+    new_hash = await auth_service.get_password_hash_async(password_data.new_password)
     current_teacher.hashed_password = new_hash
     db.commit()
     
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import numpy as np
 import pandas as pd
 import io
 from datetime import datetime
@@ -8,7 +9,6 @@ import logging
 from database import crud
 from database.models import Teacher
 from api.auth_dependencies import get_db, get_current_teacher, verify_class_ownership
-from schemas.interaction_schemas import InteractionCreate
 
 logger = logging.getLogger(__name__)
 
@@ -31,25 +31,30 @@ class CSVValidationError(BaseModel):
     value: str
     error: str
 
-# Helper function to parse timestamp
-def parse_timestamp(timestamp_str: str) -> datetime:
-    """Parse verschiedene Timestamp-Formate."""
-    formats = [
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M:%S.%f",
-        "%d.%m.%Y %H:%M:%S",
-        "%d/%m/%Y %H:%M:%S",
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%dT%H:%M:%SZ"
-    ]
-    
-    for fmt in formats:
-        try:
-            return datetime.strptime(timestamp_str, fmt)
-        except ValueError:
-            continue
-    
-    raise ValueError(f"Konnte Timestamp '{timestamp_str}' nicht parsen")
+# Unterstützte Timestamp-Formate (in dieser Reihenfolge probiert)
+TIMESTAMP_FORMATS = [
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%d.%m.%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%SZ"
+]
+
+# Helper function to parse timestamps
+def parse_timestamps(values: pd.Series) -> pd.Series:
+    """
+    Parst eine Spalte mit verschiedenen Timestamp-Formaten (TIMESTAMP_FORMATS,
+    erstes passendes Format gewinnt). Nicht parsebare Werte werden NaT.
+    """
+    values = values.astype(str)
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    for fmt in TIMESTAMP_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(values[missing], format=fmt, errors="coerce")
+    return parsed
 
 @router.post("/interactions", response_model=ImportResult)
 async def import_interactions(
@@ -86,9 +91,6 @@ async def import_interactions(
         )
     
     start_time = datetime.now()
-    errors = []
-    warnings = []
-    successful_imports = 0
     
     try:
         # Read CSV file
@@ -122,94 +124,126 @@ async def import_interactions(
                     detail="Schüler nicht in dieser Klasse gefunden"
                 )
         
-        # Process each row
-        for idx, row in df.iterrows():
-            try:
-                # Get student
-                if student_id:
-                    target_student_id = student_id
-                else:
-                    # Try to find student by ID in the class
-                    student_id_from_csv = int(row['student_id'])
-                    student = crud.get_student(db, student_id_from_csv)
-                    
-                    if not student or student.class_id != class_id:
-                        errors.append({
-                            "row": idx + 2,  # +2 wegen Header und 0-Index
-                            "error": f"Schüler {student_id_from_csv} nicht in Klasse {class_id} gefunden"
-                        })
-                        continue
-                    
-                    target_student_id = student.id
-                
-                # Convert problem and skill IDs to strings
-                problem_original_id = str(row['problem_id'])
-                skill_original_id = str(row['skill_id'])
-                
-                # Find problem and skill in DB
-                problem = crud.get_problem_by_original_id(db, problem_original_id)
-                if not problem:
-                    errors.append({
-                        "row": idx + 2,
-                        "error": f"Problem '{problem_original_id}' nicht in Datenbank gefunden"
-                    })
-                    continue
-                
-                skill = crud.get_skill_by_original_id(db, skill_original_id)
-                if not skill:
-                    errors.append({
-                        "row": idx + 2,
-                        "error": f"Skill '{skill_original_id}' nicht in Datenbank gefunden"
-                    })
-                    continue
-                
-                # Verify problem belongs to skill
-                if problem.skill_id != skill.id:
-                    warnings.append(
-                        f"Zeile {idx + 2}: Problem {problem_original_id} gehört nicht zu Skill {skill_original_id}"
-                    )
-                
-                # Parse timestamp
-                try:
-                    timestamp = parse_timestamp(str(row['timestamp']))
-                except ValueError as e:
-                    errors.append({
-                        "row": idx + 2,
-                        "error": f"Ungültiger Timestamp: {e}"
-                    })
-                    continue
-                
-                # Create interaction
-                interaction = InteractionCreate(
-                    problem_db_id=problem.id,
-                    skill_db_id=skill.id,
-                    is_correct=bool(int(row['correct'])),
-                    timestamp=timestamp
+        # Zeilen spaltenweise validieren: pro Zeile wird nur der erste Fehler gemeldet
+        row_errors = pd.Series(None, index=df.index, dtype=object)
+        row_warnings = pd.Series(None, index=df.index, dtype=object)
+        
+        def reject(mask: pd.Series, messages: pd.Series) -> None:
+            mask = mask & row_errors.isna()
+            row_errors[mask] = messages[mask]
+        
+        # Get student
+        if student_id:
+            target_student_ids = pd.Series(student_id, index=df.index)
+        else:
+            target_student_ids = pd.to_numeric(df['student_id'], errors='coerce')
+            # Alles, was den Int64-Cast scheitern lassen würde, vorher als Zeilenfehler melden
+            invalid = (
+                target_student_ids.isna()
+                | ~np.isfinite(target_student_ids.astype(float))
+                | (target_student_ids.astype(float).abs() >= 2**63)
+                | (target_student_ids % 1 != 0)
+            )
+            reject(invalid, "Ungültige student_id '" + df['student_id'].astype(str) + "'")
+            target_student_ids = target_student_ids.where(~invalid).astype("Int64")
+            
+            student_class_ids = crud.get_student_class_ids(db, target_student_ids.dropna().unique().tolist())
+            in_class = target_student_ids.map(student_class_ids) == class_id
+            reject(
+                ~in_class,
+                "Schüler " + target_student_ids.astype(str) + f" nicht in Klasse {class_id} gefunden"
+            )
+            target_student_ids = target_student_ids.where(in_class)
+        
+        # Find problem and skill in DB (Lookup-Tabellen einmalig laden)
+        problem_original_ids = df['problem_id'].astype(str)
+        skill_original_ids = df['skill_id'].astype(str)
+        problems = crud.get_problem_lookup(db)
+        skill_lookup = crud.get_skill_lookup(db)
+        
+        problem_db_ids = problem_original_ids.map(lambda v: problems[v][0] if v in problems else None).astype("Int64")
+        problem_skill_ids = problem_original_ids.map(lambda v: problems[v][1] if v in problems else None).astype("Int64")
+        skill_db_ids = skill_original_ids.map(skill_lookup).astype("Int64")
+        
+        reject(problem_db_ids.isna(), "Problem '" + problem_original_ids + "' nicht in Datenbank gefunden")
+        reject(skill_db_ids.isna(), "Skill '" + skill_original_ids + "' nicht in Datenbank gefunden")
+        
+        # Verify problem belongs to skill
+        mismatch = row_errors.isna() & (problem_skill_ids != skill_db_ids).fillna(False)
+        row_warnings[mismatch] = (
+            "Zeile " + (df.index[mismatch] + 2).astype(str) + ": Problem "
+            + problem_original_ids[mismatch] + " gehört nicht zu Skill " + skill_original_ids[mismatch]
+        )
+        reject(
+            mismatch,
+            "Problem " + problem_db_ids.astype(str) + " gehört nicht zu Skill " + skill_db_ids.astype(str)
+        )
+        
+        # Parse timestamp
+        timestamps = parse_timestamps(df['timestamp'])
+        reject(
+            timestamps.isna(),
+            "Ungültiger Timestamp: Konnte Timestamp '" + df['timestamp'].astype(str) + "' nicht parsen"
+        )
+        
+        correct = pd.to_numeric(df['correct'], errors='coerce')
+        reject(
+            correct.isna() | ~np.isfinite(correct.astype(float)),
+            "Ungültiger Wert für correct: '" + df['correct'].astype(str) + "'"
+        )
+        
+        valid = row_errors.isna()
+        candidates = pd.DataFrame({
+            "student_id": target_student_ids[valid].astype(int),
+            "problem_id": problem_db_ids[valid].astype(int),
+            "skill_id": skill_db_ids[valid].astype(int),
+            "is_correct": correct[valid].abs() >= 1,  # entspricht bool(int(x)) ohne Int-Cast
+            "timestamp": timestamps[valid]
+        })
+        
+        # Check for duplicate (in DB or earlier in this file)
+        existing_keys = crud.get_interaction_keys(db, candidates["student_id"].unique().tolist())
+        candidate_timestamps = list(candidates["timestamp"].dt.to_pydatetime())
+        in_db = pd.Series(
+            [
+                (sid, pid, ts) in existing_keys
+                for sid, pid, ts in zip(
+                    candidates["student_id"].tolist(), candidates["problem_id"].tolist(), candidate_timestamps
                 )
-                
-                # Check for duplicate
-                existing = db.query(crud.models.Interaction).filter(
-                    crud.models.Interaction.student_id == target_student_id,
-                    crud.models.Interaction.problem_id == problem.id,
-                    crud.models.Interaction.timestamp == timestamp
-                ).first()
-                
-                if existing:
-                    warnings.append(
-                        f"Zeile {idx + 2}: Interaktion bereits vorhanden, übersprungen"
-                    )
-                    continue
-                
-                # Create interaction
-                crud.create_interaction(db, interaction, target_student_id)
-                successful_imports += 1
-                
-            except Exception as e:
-                errors.append({
-                    "row": idx + 2,
-                    "error": str(e)
-                })
-                logger.error(f"Fehler bei Zeile {idx + 2}: {e}")
+            ],
+            index=candidates.index,
+            dtype=bool
+        )
+        duplicate = in_db | candidates.duplicated(subset=["student_id", "problem_id", "timestamp"])
+        row_warnings[duplicate[duplicate].index] = (
+            "Zeile " + (duplicate[duplicate].index + 2).astype(str) + ": Interaktion bereits vorhanden, übersprungen"
+        )
+        
+        errors = [{"row": idx + 2, "error": message} for idx, message in row_errors.dropna().items()]
+        warnings = row_warnings.dropna().tolist()
+        
+        keep = ~duplicate
+        pending_interactions = [
+            {
+                "student_id": sid,
+                "problem_id": pid,
+                "skill_id": skid,
+                "is_correct": is_correct,
+                "timestamp": ts
+            }
+            for sid, pid, skid, is_correct, ts, kept in zip(
+                candidates["student_id"].tolist(),
+                candidates["problem_id"].tolist(),
+                candidates["skill_id"].tolist(),
+                candidates["is_correct"].tolist(),
+                candidate_timestamps,
+                keep.tolist()
+            )
+            if kept
+        ]
+        
+        # Create interactions in batches within one transaction
+        successful_imports = crud.bulk_create_interactions(db, pending_interactions)
         
         # Calculate processing time
         processing_time = (datetime.now() - start_time).total_seconds()
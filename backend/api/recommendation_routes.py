@@ -132,10 +132,17 @@ async def predict_problem_performance(
         logger.error(f"AKT Service error: {e}")
         raise HTTPException(status_code=503, detail="AKT Service nicht verfügbar")
     
-    # Hole Interaction History
-    interactions = crud.get_student_interactions(db, student_id, sort_desc=False)
+    # Hole Interaction History und konvertiere sie
+    interaction_history = [
+        {
+            "problem_id": i.problem.original_problem_id,
+            "skill_id": i.skill.original_skill_id,
+            "correct": int(i.is_correct)
+        }
+        for i in crud.iter_student_interactions(db, student_id, sort_desc=False)
+    ]
     
-    if not interactions:
+    if not interaction_history:
         return {
             "student_id": student_id,
             "problem_id": problem_id,
@@ -144,16 +151,6 @@ async def predict_problem_performance(
             "message": "Keine Historie verfügbar, neutrale Vorhersage"
         }
     
-    # Konvertiere History
-    interaction_history = [
-        {
-            "problem_id": i.problem.original_problem_id,
-            "skill_id": i.skill.original_skill_id,
-            "correct": int(i.is_correct)
-        }
-        for i in interactions
-    ]
-    
     # Vorhersage mit AKT
     try:
         success_probability = akt_service.predict_next_correct_probability(
@@ -212,14 +209,13 @@ async def get_skill_prognosis(
         raise HTTPException(status_code=503, detail="AKT Service nicht verfügbar")
     
     # Interaction History
-    interactions = crud.get_student_interactions(db, student_id, sort_desc=False)
     interaction_history = [
         {
             "problem_id": i.problem.original_problem_id,
             "skill_id": i.skill.original_skill_id,
             "correct": int(i.is_correct)
         }
-        for i in interactions
+        for i in crud.iter_student_interactions(db, student_id, sort_desc=False)
     ]
     
     # Hole alle Probleme für diesen Skill
@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
-from typing import List, Optional, Dict, Any 
-from datetime import datetime 
+from sqlalchemy import Numeric, case, delete, desc, exists, func, insert, literal_column, select, update
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Set, Tuple
+from datetime import datetime
+from itertools import islice
+import threading
+import time
 from . import models
 from passlib.context import CryptContext
 import schemas
@@ -11,7 +14,69 @@ from schemas.student_schemas import StudentCreate
 from schemas.skill_schemas import SkillCreate
 from schemas.problem_schemas import ProblemCreate
 from schemas.interaction_schemas import InteractionCreate, InteractionCSVRow
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
+
+# Filter für nicht gelöschte Schüler (einmalig beim Import gebaut)
+_ACTIVE_STUDENT_FILTER = models.Student.is_deleted == False
+
+# Blockgröße für serverseitige Cursor (yield_per) bei Streaming-Abfragen
+STREAM_CHUNK_SIZE = 500
+
+# Prozesslokaler Cache internal_idx → DB-ID für Skills/Problems (quasi statische Daten)
+_SKILL_IDX_TO_ID: Dict[int, int] = {}
+_PROBLEM_IDX_TO_ID: Dict[int, int] = {}
+_internal_idx_cache_preloaded = set()
+# Nicht gefundene internal_idx → Zeitpunkt der Abfrage (negativer Cache mit TTL)
+INTERNAL_IDX_MISS_TTL_SECONDS = 60
+_internal_idx_misses: Dict[Any, Dict[int, float]] = {models.Skill: {}, models.Problem: {}}
+_internal_idx_cache_lock = threading.Lock()
+
+def _get_id_by_internal_idx(db: Session, model, cache: Dict[int, int], internal_idx: int) -> Optional[int]:
+    """
+    Löst internal_idx über den Cache auf; beim ersten Zugriff wird die ganze Tabelle geladen.
+    Die DB-Abfragen laufen außerhalb des Locks, der Lock schützt nur die Dicts.
+    """
+    misses = _internal_idx_misses[model]
+    with _internal_idx_cache_lock:
+        preloaded = model in _internal_idx_cache_preloaded
+        db_id = cache.get(internal_idx)
+        missed_at = misses.get(internal_idx)
+    if db_id is not None:
+        return db_id
+    
+    if not preloaded:
+        rows = db.execute(select(model.internal_idx, model.id)).all()
+        with _internal_idx_cache_lock:
+            cache.update(rows)
+            _internal_idx_cache_preloaded.add(model)
+            db_id = cache.get(internal_idx)
+        if db_id is not None:
+            return db_id
+    elif missed_at is not None and time.monotonic() - missed_at < INTERNAL_IDX_MISS_TTL_SECONDS:
+        return None
+    
+    db_id = db.execute(select(model.id).where(model.internal_idx == internal_idx)).scalar()
+    with _internal_idx_cache_lock:
+        if db_id is not None:
+            cache[internal_idx] = db_id
+            misses.pop(internal_idx, None)
+        else:
+            misses[internal_idx] = time.monotonic()
+    return db_id
+
+# Prozesslokaler Cache für get_student_statistics (student_id → (Zeitpunkt, Statistik)).
+# Wird bei neuen Interaktionen invalidiert, die TTL begrenzt die Veraltung bei
+# mehreren Worker-Prozessen.
+STUDENT_STATS_CACHE_TTL_SECONDS = 60
+_student_stats_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+_student_stats_cache_lock = threading.Lock()
+
+# activity_status nach "gibt es eine letzte Aktivität" (False/True) indiziert
+_ACTIVITY_STATUS = ("no_activity", "active")
+
+def invalidate_student_statistics(student_id: int) -> None:
+    with _student_stats_cache_lock:
+        _student_stats_cache.pop(student_id, None)
 
 # Passwort-Hashing-Kontext für Teacher
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -24,7 +89,7 @@ def get_password_hash(password: str) -> str:
 
 # CRUD Operationen für Teacher
 def get_teacher(db: Session, teacher_id: int) -> Optional[models.Teacher]:
-    return db.query(models.Teacher).filter(models.Teacher.id == teacher_id).first()
+    return db.get(models.Teacher, teacher_id)
 
 def get_teacher_by_username(db: Session, username: str) -> Optional[models.Teacher]:
     return db.query(models.Teacher).filter(models.Teacher.username == username).first()
@@ -37,12 +102,11 @@ def create_teacher(db: Session, teacher: schemas.TeacherCreate) -> models.Teache
     db_teacher = models.Teacher(username=teacher.username, hashed_password=hashed_password)
     db.add(db_teacher)
     db.commit()
-    db.refresh(db_teacher)
     return db_teacher
 
 # CRUD Operationen für Class
 def get_class(db: Session, class_id: int) -> Optional[models.Class]:
-    return db.query(models.Class).filter(models.Class.id == class_id).first()
+    return db.get(models.Class, class_id)
 
 def get_classes_by_teacher(db: Session, teacher_id: int, skip: int = 0, limit: int = 100) -> List[models.Class]:
     return db.query(models.Class).filter(models.Class.teacher_id == teacher_id).offset(skip).limit(limit).all()
@@ -51,7 +115,6 @@ def create_class_for_teacher(db: Session, class_data: schemas.ClassCreate, teach
     db_class = models.Class(**class_data.model_dump(), teacher_id=teacher_id)
     db.add(db_class)
     db.commit()
-    db.refresh(db_class)
     return db_class
 
 def update_class(db: Session, class_id: int, class_update_data: schemas.ClassCreate) -> Optional[models.Class]:
@@ -68,53 +131,92 @@ def delete_class(db: Session, class_id: int) -> Optional[models.Class]:
     if not db_class:
         return None
     
-    active_student_count = db.query(models.Student).filter(
-        models.Student.class_id == class_id,
-        models.Student.is_deleted == False
-    ).count()
-    
-    if active_student_count > 0:
-        raise ValueError(f"Klasse kann nicht gelöscht werden. Bitte erst die {active_student_count} Schüler löschen.")
-    
-    deleted_students = db.query(models.Student).filter(
+    # Gelöschte Schüler samt Interaktionen per Bulk-DELETE entfernen
+    # (umgeht die ORM-Kaskade, daher Interaktionen explizit)
+    deleted_student_ids = select(models.Student.id).where(
         models.Student.class_id == class_id,
         models.Student.is_deleted == True
-    ).all()
+    )
+    db.execute(
+        delete(models.Interaction).where(models.Interaction.student_id.in_(deleted_student_ids)),
+        execution_options={"synchronize_session": False}
+    )
+    db.execute(
+        delete(models.Student).where(
+            models.Student.class_id == class_id,
+            models.Student.is_deleted == True
+        )
+    )
+    
+    # Klasse nur löschen, wenn keine aktiven Schüler mehr existieren
+    deleted_class_id = db.execute(
+        delete(models.Class).where(
+            models.Class.id == class_id,
+            ~select(models.Student.id).where(
+                models.Student.class_id == class_id,
+                _ACTIVE_STUDENT_FILTER
+            ).exists()
+        ).returning(models.Class.id)
+    ).scalar()
     
-    for student in deleted_students:
-        db.delete(student)
+    if deleted_class_id is None:
+        db.rollback()
+        active_student_count = db.query(models.Student).filter(
+            models.Student.class_id == class_id,
+            _ACTIVE_STUDENT_FILTER
+        ).count()
+        raise ValueError(f"Klasse kann nicht gelöscht werden. Bitte erst die {active_student_count} Schüler löschen.")
     
-    db.delete(db_class)
     db.commit()
     return db_class
 
 # CRUD Operationen für Student
 def get_student(db: Session, student_id: int) -> Optional[models.Student]:
-    return db.query(models.Student).filter(models.Student.id == student_id).first()
+    return db.get(models.Student, student_id)
 
 def get_students_by_class(db: Session, class_id: int, skip: int = 0, limit: int = 100) -> List[models.Student]:
-    query = db.query(models.Student).filter(models.Student.class_id == class_id)
-    
-    # Wenn is_deleted existiert filtert gelöschte Schüler aus
-    if hasattr(models.Student, 'is_deleted'):
-        query = query.filter(models.Student.is_deleted == False)
-    
-    return query.offset(skip).limit(limit).all()
+    return db.query(models.Student).filter(
+        models.Student.class_id == class_id,
+        _ACTIVE_STUDENT_FILTER
+    ).offset(skip).limit(limit).all()
 
 def search_students_in_class(db: Session, class_id: int, query: str, skip: int = 0, limit: int = 100) -> List[models.Student]:
+    """
+    Sucht aktive Schüler einer Klasse über den vollen Namen.
+    
+    Suchbegriff und Name werden beide per SQL lower() verglichen (wie bei ilike),
+    damit Umlaute in SQLite gleich behandelt werden, z.B. findet "Ö" den Schüler "Özil".
+    """
+    # Ausdruck entspricht ix_students_name_trgm, damit PostgreSQL den Trigram-Index nutzt
     search_query = f"%{query}%"
+    full_name = func.lower(models.Student.first_name + literal_column("' '") + models.Student.last_name)
     return db.query(models.Student).filter(
         models.Student.class_id == class_id,
-        (models.Student.first_name.ilike(search_query) | models.Student.last_name.ilike(search_query))
+        _ACTIVE_STUDENT_FILTER,
+        full_name.like(func.lower(search_query))
     ).offset(skip).limit(limit).all()
 
 def create_student_in_class(db: Session, student: schemas.StudentCreate, class_id: int) -> models.Student:
     db_student = models.Student(**student.model_dump(), class_id=class_id, last_interaction_update_timestamp=datetime.utcnow())
     db.add(db_student)
     db.commit()
-    db.refresh(db_student)
     return db_student
 
+def bulk_create_students(db: Session, students: List[schemas.StudentCreate], class_id: int) -> List[models.Student]:
+    """Legt mehrere Schüler einer Klasse mit einem einzigen INSERT an."""
+    if not students:
+        return []
+    now = datetime.utcnow()
+    db_students = db.scalars(
+        insert(models.Student).returning(models.Student),
+        [
+            {**student.model_dump(), "class_id": class_id, "last_interaction_update_timestamp": now}
+            for student in students
+        ]
+    ).all()
+    db.commit()
+    return db_students
+
 def update_student(db: Session, student_id: int, student_update_data: schemas.StudentCreate) -> Optional[models.Student]:
     db_student = get_student(db, student_id)
     if db_student:
@@ -124,13 +226,15 @@ def update_student(db: Session, student_id: int, student_update_data: schemas.St
         db.refresh(db_student)
     return db_student
     
-def update_student_last_interaction_timestamp(db: Session, student_id: int, timestamp: datetime = None) -> Optional[models.Student]:
-    db_student = get_student(db, student_id)
-    if db_student:
-        db_student.last_interaction_update_timestamp = timestamp if timestamp else datetime.utcnow()
-        db.commit()
-        db.refresh(db_student)
-    return db_student
+def update_student_last_interaction_timestamp(db: Session, student_id: int, timestamp: datetime = None) -> int:
+    """Setzt den Zeitstempel mit einem einzelnen UPDATE. Gibt die Anzahl geänderter Zeilen zurück."""
+    result = db.execute(
+        update(models.Student)
+        .where(models.Student.id == student_id)
+        .values(last_interaction_update_timestamp=timestamp if timestamp else datetime.utcnow())
+    )
+    db.commit()
+    return result.rowcount
 
 def delete_student(db: Session, student_id: int) -> Optional[models.Student]:
     db_student = get_student(db, student_id)
@@ -143,10 +247,11 @@ def delete_student(db: Session, student_id: int) -> Optional[models.Student]:
 
 # CRUD Operationen für Skill
 def get_skill(db: Session, skill_id: int) -> Optional[models.Skill]: 
-    return db.query(models.Skill).filter(models.Skill.id == skill_id).first()
+    return db.get(models.Skill, skill_id)
 
 def get_skill_by_internal_idx(db: Session, internal_idx: int) -> Optional[models.Skill]:
-    return db.query(models.Skill).filter(models.Skill.internal_idx == internal_idx).first()
+    skill_id = _get_id_by_internal_idx(db, models.Skill, _SKILL_IDX_TO_ID, internal_idx)
+    return db.get(models.Skill, skill_id) if skill_id is not None else None
 
 def get_skill_by_name(db: Session, name: str) -> Optional[models.Skill]:
     return db.query(models.Skill).filter(models.Skill.name == name).first()
@@ -165,15 +270,18 @@ def create_skill(db: Session, skill: schemas.SkillCreate) -> models.Skill:
     )
     db.add(db_skill)
     db.commit()
-    db.refresh(db_skill)
+    with _internal_idx_cache_lock:
+        _SKILL_IDX_TO_ID[db_skill.internal_idx] = db_skill.id
+        _internal_idx_misses[models.Skill].pop(db_skill.internal_idx, None)
     return db_skill
 
 # CRUD Operationen für Problem
 def get_problem(db: Session, problem_id: int) -> Optional[models.Problem]: 
-    return db.query(models.Problem).filter(models.Problem.id == problem_id).first()
+    return db.get(models.Problem, problem_id)
 
 def get_problem_by_internal_idx(db: Session, internal_idx: int) -> Optional[models.Problem]:
-    return db.query(models.Problem).filter(models.Problem.internal_idx == internal_idx).first()
+    problem_id = _get_id_by_internal_idx(db, models.Problem, _PROBLEM_IDX_TO_ID, internal_idx)
+    return db.get(models.Problem, problem_id) if problem_id is not None else None
 
 def get_problem_by_original_id(db: Session, original_problem_id: str) -> Optional[models.Problem]:
     return db.query(models.Problem).filter(models.Problem.original_problem_id == original_problem_id).first()
@@ -182,26 +290,28 @@ def get_problems_by_skill_id(db: Session, skill_id: int, skip: int = 0, limit: i
     return db.query(models.Problem).filter(models.Problem.skill_id == skill_id).offset(skip).limit(limit).all()
 
 def get_problems_by_skill_internal_idx(db: Session, skill_internal_idx: int, skip: int = 0, limit: int = 3200) -> List[models.Problem]:
-    skill = get_skill_by_internal_idx(db, internal_idx=skill_internal_idx)
-    if not skill:
+    skill_id = _get_id_by_internal_idx(db, models.Skill, _SKILL_IDX_TO_ID, skill_internal_idx)
+    if skill_id is None:
         return []
-    return db.query(models.Problem).filter(models.Problem.skill_id == skill.id).offset(skip).limit(limit).all()
+    return db.query(models.Problem).filter(models.Problem.skill_id == skill_id).offset(skip).limit(limit).all()
 
 def create_problem(db: Session, problem: schemas.ProblemCreate) -> models.Problem:
-    db_skill = get_skill_by_internal_idx(db, internal_idx=problem.skill_internal_idx)
-    if not db_skill:
+    skill_id = _get_id_by_internal_idx(db, models.Skill, _SKILL_IDX_TO_ID, problem.skill_internal_idx)
+    if skill_id is None:
         raise ValueError(f"Skill mit internal_idx {problem.skill_internal_idx} nicht gefunden")
     
     db_problem = models.Problem(
         internal_idx=problem.internal_idx,
         original_problem_id=problem.original_problem_id,
         description_placeholder=problem.description_placeholder,
-        skill_id=db_skill.id,
+        skill_id=skill_id,
         difficulty_mu_q=problem.difficulty_mu_q 
     )
     db.add(db_problem)
     db.commit()
-    db.refresh(db_problem)
+    with _internal_idx_cache_lock:
+        _PROBLEM_IDX_TO_ID[db_problem.internal_idx] = db_problem.id
+        _internal_idx_misses[models.Problem].pop(db_problem.internal_idx, None)
     return db_problem
 
 def update_problem_mu_q(db: Session, problem_internal_idx: int, mu_q: float) -> Optional[models.Problem]:
@@ -214,24 +324,35 @@ def update_problem_mu_q(db: Session, problem_internal_idx: int, mu_q: float) ->
 
 # CRUD Operationen für Interaction
 def get_interaction(db: Session, interaction_id: int) -> Optional[models.Interaction]:
-    return db.query(models.Interaction).filter(models.Interaction.id == interaction_id).first()
+    return db.get(models.Interaction, interaction_id)
 
-def get_student_interactions(
+def _student_interactions_query(
     db: Session, 
     student_id: int, 
-    limit: Optional[int] = None, 
-    sort_desc: bool = True, 
-    start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None,
-    skill_id: Optional[int] = None
-) -> List[models.Interaction]:
+    limit: Optional[int], 
+    sort_desc: bool, 
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    skill_id: Optional[int]
+):
     """
-    Ruft Interaktionen eines Schülers mit Eager Loading für Relationships.
+    Baut die Abfrage für get_student_interactions/iter_student_interactions.
+    
+    selectinload lädt Problems/Skills in je einer separaten IN-Abfrage nach
+    der Paginierung, statt die Hauptabfrage per JOIN aufzublähen. Es werden
+    nur die Spalten geladen, die von den API-Routen gelesen werden.
     """
     query = db.query(models.Interaction)\
         .options(
-            joinedload(models.Interaction.problem),
-            joinedload(models.Interaction.skill)
+            selectinload(models.Interaction.problem).load_only(
+                models.Problem.original_problem_id,
+                models.Problem.difficulty_mu_q,
+                models.Problem.description_placeholder
+            ),
+            selectinload(models.Interaction.skill).load_only(
+                models.Skill.original_skill_id,
+                models.Skill.name
+            )
         )\
         .filter(models.Interaction.student_id == student_id)
     
@@ -250,14 +371,54 @@ def get_student_interactions(
     if limit:
         query = query.limit(limit)
     
-    return query.all()
+    return query
+
+def get_student_interactions(
+    db: Session, 
+    student_id: int, 
+    limit: Optional[int] = None, 
+    sort_desc: bool = True, 
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    skill_id: Optional[int] = None
+) -> List[models.Interaction]:
+    """
+    Ruft Interaktionen eines Schülers mit Eager Loading für Relationships.
+    """
+    return _student_interactions_query(
+        db, student_id, limit, sort_desc, start_date, end_date, skill_id
+    ).all()
+
+def iter_student_interactions(
+    db: Session, 
+    student_id: int, 
+    limit: Optional[int] = None, 
+    sort_desc: bool = True, 
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    skill_id: Optional[int] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[models.Interaction]:
+    """
+    Wie get_student_interactions, liefert die Interaktionen aber blockweise
+    über einen serverseitigen Cursor statt als komplette Liste.
+    """
+    query = _student_interactions_query(
+        db, student_id, limit, sort_desc, start_date, end_date, skill_id
+    )
+    yield from query.yield_per(chunk_size)
 
 def create_interaction(db: Session, interaction: schemas.InteractionCreate, student_id: int) -> models.Interaction:
-    db_problem = get_problem(db, interaction.problem_db_id)
-    if not db_problem:
-        raise ValueError(f"Problem mit ID {interaction.problem_db_id} nicht gefunden")
+    # Existenz und Skill-Zuordnung in einer indizierten Abfrage prüfen
+    problem_matches_skill = db.query(exists().where(
+        models.Problem.id == interaction.problem_db_id,
+        models.Problem.skill_id == interaction.skill_db_id
+    )).scalar()
     
-    if db_problem.skill_id != interaction.skill_db_id:
+    if not problem_matches_skill:
+        problem_exists = db.query(exists().where(models.Problem.id == interaction.problem_db_id)).scalar()
+        if not problem_exists:
+            raise ValueError(f"Problem mit ID {interaction.problem_db_id} nicht gefunden")
         raise ValueError(f"Problem {interaction.problem_db_id} gehört nicht zu Skill {interaction.skill_db_id}")
     
     db_interaction = models.Interaction(
@@ -269,8 +430,8 @@ def create_interaction(db: Session, interaction: schemas.InteractionCreate, stud
     )
     db.add(db_interaction)
     db.commit()
-    db.refresh(db_interaction)
     update_student_last_interaction_timestamp(db, student_id=student_id, timestamp=interaction.timestamp)
+    invalidate_student_statistics(student_id)
     return db_interaction
 
 def create_interaction_from_csv(db: Session, csv_row: schemas.InteractionCSVRow, student_id: int) -> Optional[models.Interaction]:
@@ -298,47 +459,147 @@ def create_interaction_from_csv(db: Session, csv_row: schemas.InteractionCSVRow,
     except ValueError:
         return None
 
+# Anzahl der Zeilen pro INSERT-Batch beim CSV-Import
+CSV_IMPORT_BATCH_SIZE = 1000
+
+def get_problem_lookup(db: Session) -> Dict[str, Tuple[int, int]]:
+    """Original-Problem-ID → (DB-ID, Skill-DB-ID) für alle Problems in einer Abfrage."""
+    return {
+        original_id: (db_id, skill_id) for db_id, original_id, skill_id in
+        db.execute(select(models.Problem.id, models.Problem.original_problem_id, models.Problem.skill_id))
+    }
+
+def get_skill_lookup(db: Session) -> Dict[str, int]:
+    """Original-Skill-ID → DB-ID für alle Skills in einer Abfrage (erster Treffer gewinnt)."""
+    skill_ids: Dict[str, int] = {}
+    for db_id, original_id in db.execute(
+        select(models.Skill.id, models.Skill.original_skill_id).order_by(models.Skill.id)
+    ):
+        skill_ids.setdefault(original_id, db_id)
+    return skill_ids
+
+def get_student_class_ids(db: Session, student_ids: List[int]) -> Dict[int, int]:
+    """Schüler-ID → Klassen-ID für mehrere Schüler in einer Abfrage."""
+    if not student_ids:
+        return {}
+    return dict(db.execute(
+        select(models.Student.id, models.Student.class_id).where(models.Student.id.in_(student_ids))
+    ).all())
+
+def get_interaction_keys(db: Session, student_ids: List[int]) -> Set[Tuple[int, int, datetime]]:
+    """
+    Vorhandene (student_id, problem_id, timestamp) Tupel der Schüler, zur
+    Duplikaterkennung beim CSV-Import. Bei zeitzonen-behafteten Zeitstempeln wird
+    nur die tzinfo entfernt: die Datenbank liefert sie in der Zeitzone der Session,
+    in der auch die naiven CSV-Werte beim Einfügen interpretiert werden.
+    """
+    if not student_ids:
+        return set()
+    keys = set()
+    for sid, pid, ts in db.execute(
+        select(models.Interaction.student_id, models.Interaction.problem_id, models.Interaction.timestamp)
+        .where(models.Interaction.student_id.in_(student_ids))
+    ):
+        if ts.tzinfo is not None:
+            ts = ts.replace(tzinfo=None)
+        keys.add((sid, pid, ts))
+    return keys
+
+def bulk_create_interactions(
+    db: Session,
+    interactions: Iterable[Dict[str, Any]],
+    batch_size: int = CSV_IMPORT_BATCH_SIZE
+) -> int:
+    """
+    Fügt Interaktionen batchweise in einer Transaktion ein.
+    
+    Erwartet Dicts mit student_id, problem_id, skill_id, is_correct und timestamp
+    (bereits aufgelöste DB-IDs). Der Zeitstempel jedes betroffenen Schülers wird
+    nur einmal am Ende mit dem spätesten importierten Zeitstempel aktualisiert.
+    
+    Returns:
+        Anzahl der eingefügten Interaktionen
+    """
+    inserted = 0
+    latest_timestamps: Dict[int, datetime] = {}
+    row_iter = iter(interactions)
+    try:
+        while True:
+            batch = list(islice(row_iter, batch_size))
+            if not batch:
+                break
+            db.execute(insert(models.Interaction), batch)
+            inserted += len(batch)
+            for row in batch:
+                latest = latest_timestamps.get(row["student_id"])
+                if latest is None or row["timestamp"] > latest:
+                    latest_timestamps[row["student_id"]] = row["timestamp"]
+        
+        for student_id, timestamp in latest_timestamps.items():
+            db.execute(
+                update(models.Student)
+                .where(models.Student.id == student_id)
+                .values(last_interaction_update_timestamp=timestamp)
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    
+    for student_id in latest_timestamps:
+        invalidate_student_statistics(student_id)
+    
+    return inserted
+
 def get_student_statistics(db: Session, student_id: int) -> Dict[str, Any]:
     """
     Berechnet Statistiken für einen Schüler.
     
+    Ergebnisse werden pro Prozess zwischengespeichert (siehe STUDENT_STATS_CACHE_TTL_SECONDS)
+    und beim Anlegen von Interaktionen invalidiert.
+    
     Returns:
         Dict mit total_interactions, correct_interactions, accuracy, skills_practiced, etc.
     """
-    from sqlalchemy import func
+    now = time.monotonic()
+    with _student_stats_cache_lock:
+        cached = _student_stats_cache.get(student_id)
+    if cached and now - cached[0] < STUDENT_STATS_CACHE_TTL_SECONDS:
+        return dict(cached[1])
     
     student = get_student(db, student_id)
     if not student:
         return {}  
     
-    total = db.query(func.count(models.Interaction.id))\
-        .filter(models.Interaction.student_id == student_id).scalar() or 0
-    
-    correct = db.query(func.count(models.Interaction.id))\
-        .filter(
-            models.Interaction.student_id == student_id,
-            models.Interaction.is_correct == True
-        ).scalar() or 0
-    
-    skills_practiced = db.query(func.count(func.distinct(models.Interaction.skill_id)))\
-        .filter(models.Interaction.student_id == student_id).scalar() or 0
-    
-    last_activity = db.query(func.max(models.Interaction.timestamp))\
-        .filter(models.Interaction.student_id == student_id).scalar()
-    
-    problems_attempted = db.query(func.count(func.distinct(models.Interaction.problem_id)))\
-        .filter(models.Interaction.student_id == student_id).scalar() or 0
+    total = func.count(models.Interaction.id)
+    correct = func.sum(case((models.Interaction.is_correct == True, 1), else_=0))
+    row = db.query(
+        total.label("total"),
+        func.coalesce(correct, 0).label("correct"),
+        func.count(func.distinct(models.Interaction.skill_id)).label("skills_practiced"),
+        func.count(func.distinct(models.Interaction.problem_id)).label("problems_attempted"),
+        func.max(models.Interaction.timestamp).label("last_activity"),
+        # 100.0 als Literal: numeric in PostgreSQL (round(numeric, int)), Gleitkomma in SQLite
+        func.coalesce(
+            func.round(correct * literal_column("100.0", Numeric) / func.nullif(total, 0), 2), 0
+        ).label("accuracy")
+    ).filter(models.Interaction.student_id == student_id).one()
     
-    return {
-        "total_interactions": total,
-        "correct_interactions": correct,
-        "incorrect_interactions": total - correct,
-        "accuracy": round((correct / total * 100) if total > 0 else 0, 2),
-        "skills_practiced": skills_practiced,
-        "problems_attempted": problems_attempted,
+    last_activity = row.last_activity
+    stats = {
+        "total_interactions": row.total,
+        "correct_interactions": row.correct,
+        "incorrect_interactions": row.total - row.correct,
+        "accuracy": float(row.accuracy),
+        "skills_practiced": row.skills_practiced,
+        "problems_attempted": row.problems_attempted,
         "last_activity": last_activity.isoformat() if last_activity else None,
-        "activity_status": "active" if last_activity else "no_activity"
+        "activity_status": _ACTIVITY_STATUS[last_activity is not None]
     }
+    
+    with _student_stats_cache_lock:
+        _student_stats_cache[student_id] = (now, stats)
+    return dict(stats)
 
 def get_classes_for_dashboard(db: Session, teacher_id: int, limit: int = 5) -> List[Dict[str, Any]]:
     """
@@ -347,24 +608,16 @@ def get_classes_for_dashboard(db: Session, teacher_id: int, limit: int = 5) -> L
     """
     from .models import Student, Class  
 
-    student_count_subquery = (
-        db.query(
-            Student.class_id,
-            func.count(Student.id).label("student_count")
-        )
-        .filter(Student.is_deleted == False)
-        .group_by(Student.class_id)
-        .subquery()
-    )
-
+    # Zählt nur die Schüler der Klassen dieser Lehrkraft in einem gruppierten Scan
     query_result = (
         db.query(
             Class.id,
             Class.name,
-            func.coalesce(student_count_subquery.c.student_count, 0).label("student_count")
+            func.count(Student.id).filter(Student.is_deleted == False).label("student_count")
         )
-        .outerjoin(student_count_subquery, Class.id == student_count_subquery.c.class_id)
+        .outerjoin(Student, Student.class_id == Class.id)
         .filter(Class.teacher_id == teacher_id)
+        .group_by(Class.id)
         .order_by(desc(Class.created_at)) 
         .limit(limit)
         .all()
@@ -4,12 +4,36 @@ from sqlalchemy.orm import sessionmaker
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./empfehlungssystem.db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False} 
-)
+engine_options = {
+    "insertmanyvalues_page_size": 1000,
+    # Größerer Cache für kompilierte SQL-Statements (Standard: 500)
+    "query_cache_size": 2048
+}
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    engine_options["connect_args"] = {"check_same_thread": False}
+else:
+    # Connection Pool für parallele FastAPI-Requests
+    engine_options.update(
+        pool_size=20,
+        max_overflow=40,
+        pool_pre_ping=True,
+        pool_recycle=1800
+    )
+
+if SQLALCHEMY_DATABASE_URL.startswith("postgresql+psycopg2"):
+    # psycopg2 Fast-Execution-Helpers für executemany (Bulk-Importe)
+    engine_options["executemany_mode"] = "values_plus_batch"
+    engine_options["executemany_batch_page_size"] = 500
+elif SQLALCHEMY_DATABASE_URL.startswith("postgresql+psycopg"):
+    # psycopg 3: serverseitige Prepared Statements nach 5 Ausführungen
+    engine_options["connect_args"] = {"prepare_threshold": 5}
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options)
+
+# expire_on_commit=False: frisch angelegte Objekte bleiben nach dem Commit geladen,
+# sonst würde jeder Attributzugriff erneut ein SELECT auslösen
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
@@ -1,9 +1,16 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Float, Text
+from sqlalchemy import Boolean, Column, DDL, ForeignKey, Index, Integer, String, DateTime, Float, Text, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func 
 
 from .db_setup import Base 
 
+# pg_trgm wird für den Trigram-Index der Schülersuche benötigt (nur PostgreSQL)
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
 class Teacher(Base):
     __tablename__ = "teachers"
 
@@ -13,6 +20,9 @@ class Teacher(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     classes = relationship("Class", back_populates="teacher")
 
+    # Server-Defaults (created_at) per INSERT ... RETURNING laden, kein refresh() nötig
+    __mapper_args__ = {"eager_defaults": True}
+
 class Class(Base):
     __tablename__ = "classes"
 
@@ -24,6 +34,11 @@ class Class(Base):
     teacher = relationship("Teacher", back_populates="classes")
     students = relationship("Student", back_populates="class_") 
 
+    __table_args__ = (
+        Index("ix_classes_teacher_created", "teacher_id", "created_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
 class Student(Base):
     __tablename__ = "students"
 
@@ -38,6 +53,24 @@ class Student(Base):
     class_ = relationship("Class", back_populates="students") 
     interactions = relationship("Interaction", back_populates="student", cascade="all, delete-orphan")
 
+    # Partieller Index: nur aktive (nicht gelöschte) Schüler pro Klasse
+    # Trigram-Index für die Namenssuche (ILIKE '%...%'), nur PostgreSQL
+    __table_args__ = (
+        Index(
+            "ix_students_class_notdeleted", "class_id", "is_deleted",
+            postgresql_where=(is_deleted == False),
+            sqlite_where=(is_deleted == False)
+        ),
+        Index(
+            "ix_students_name_trgm",
+            func.lower(first_name + " " + last_name).label("full_name_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"full_name_lower": "gin_trgm_ops"},
+            postgresql_where=(is_deleted == False)
+        ).ddl_if(dialect="postgresql"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
 class Skill(Base): 
     __tablename__ = "skills"
 
@@ -73,3 +106,9 @@ class Interaction(Base):
     student = relationship("Student", back_populates="interactions")
     problem = relationship("Problem", back_populates="interactions")
     skill = relationship("Skill", back_populates="interactions")
+
+    # Deckt "WHERE student_id = ? ORDER BY timestamp" und Filter nach Skill ab
+    __table_args__ = (
+        Index("ix_interactions_student_ts", "student_id", "timestamp"),
+        Index("ix_interactions_student_skill", "student_id", "skill_id"),
+    )
@@ -1,15 +1,38 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from config import settings
+import asyncio
+import hashlib
+import hmac
 import logging
+import os
+import threading
 
 logger = logging.getLogger(__name__)
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Cache für erfolgreich verifizierte Passwort/Hash-Paare (pro Prozess).
+# Schlüssel ist ein HMAC über Hash und Klartext mit einem zufälligen
+# Prozess-Schlüssel, der Klartext selbst wird nie gespeichert.
+VERIFY_CACHE_SIZE = 4096
+_verify_cache_key = os.urandom(32)
+_verify_cache: "OrderedDict[bytes, bool]" = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+# Thread-Pool für bcrypt, damit async Handler den Event Loop nicht blockieren
+# (bcrypt gibt während des Hashens den GIL frei)
+_hash_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="bcrypt")
+
+def _verify_cache_mac(plain_password: str, hashed_password: str) -> bytes:
+    message = hashed_password.encode() + b"\x00" + plain_password.encode()
+    return hmac.new(_verify_cache_key, message, hashlib.sha256).digest()
+
 class AuthService:
     """Service für Authentication und JWT Token Management."""
     
@@ -66,13 +89,45 @@ class AuthService:
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """Verifiziert ein Passwort gegen seinen Hash."""
-        return pwd_context.verify(plain_password, hashed_password)
+        """
+        Verifiziert ein Passwort gegen seinen Hash.
+        
+        Erfolgreiche Verifikationen werden in einem LRU-Cache gehalten, damit
+        wiederholte Prüfungen desselben Paares nicht erneut bcrypt ausführen.
+        """
+        mac = _verify_cache_mac(plain_password, hashed_password)
+        with _verify_cache_lock:
+            if mac in _verify_cache:
+                _verify_cache.move_to_end(mac)
+                return True
+        
+        if not pwd_context.verify(plain_password, hashed_password):
+            return False
+        
+        with _verify_cache_lock:
+            _verify_cache[mac] = True
+            if len(_verify_cache) > VERIFY_CACHE_SIZE:
+                _verify_cache.popitem(last=False)
+        return True
     
     @staticmethod
     def get_password_hash(password: str) -> str:
         """Erstellt einen Passwort Hash."""
         return pwd_context.hash(password)
+    
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """Wie verify_password, aber im Thread-Pool ausgeführt."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _hash_pool, AuthService.verify_password, plain_password, hashed_password
+        )
+    
+    @staticmethod
+    async def get_password_hash_async(password: str) -> str:
+        """Wie get_password_hash, aber im Thread-Pool ausgeführt."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_pool, pwd_context.hash, password)
 
 # Singleton Instance
 auth_service = AuthService()
\ No newline at end of file